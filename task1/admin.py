@@ -30,8 +30,8 @@ class Admin(Person):
     @classmethod
     def from_dict(cls, data):
         admin = cls.__new__(cls)
-        Person.__init__(admin, data["username"], data["name"], data["email"], "placeholder")
-        admin.set_password_hash(data["password_hash"])
+        Person.__init__(admin, data["username"], data["name"], data["email"], None,
+                        data["password_hash"])
         admin._adminLevel = data.get("admin_level", 1)
         return admin
 
@@ -0,0 +1,185 @@
+"""
+Streaming dashboard analytics for the Flight Booking System.
+The System feeds every booking change in here, so the dashboard
+never has to scan all flights and passengers again.
+"""
+
+from heaps import MaxHeap
+
+
+class TopK:
+    """Keeps the K highest-scoring keys using a lazily pruned MaxHeap."""
+
+    def __init__(self, k):
+        self._k = k
+        self._scores = {}       # key -> current score
+        self._heap = MaxHeap()  # (score, key) entries, may contain stale ones
+        self._cache = None
+
+    def update(self, key, score):
+        # Old entries for `key` stay in the heap and are skipped when popped
+        self._scores[key] = score
+        self._heap.insert((score, key))
+        self._cache = None
+        self._compact()
+
+    def load(self, scores):
+        # Bulk replace all scores, building the heap in O(n) instead of n inserts
+        self._scores = dict(scores)
+        self._heap.build_heap([(s, k) for k, s in self._scores.items()])
+        self._cache = None
+
+    def remove(self, key):
+        if key in self._scores:
+            del self._scores[key]
+            self._cache = None
+
+    def get_score(self, key):
+        return self._scores.get(key, 0)
+
+    def top(self):
+        if self._cache is None:
+            result = []
+            seen = set()
+            while self._heap.heap and len(result) < self._k:
+                score, key = self._heap.extract_max()
+                # Drop outdated scores and duplicate copies of the same entry
+                if key in seen or self._scores.get(key) != score:
+                    continue
+                seen.add(key)
+                result.append((key, score))
+            # Put the live entries back so the next query finds them again
+            for key, score in result:
+                self._heap.insert((score, key))
+            self._cache = result
+        return list(self._cache)
+
+    def _compact(self):
+        # Rebuild in O(n) once stale entries outnumber the live ones
+        if len(self._heap.heap) > 2 * len(self._scores) + self._k:
+            self._heap.build_heap([(s, k) for k, s in self._scores.items()])
+
+
+class BookingAnalytics:
+    """Incrementally maintained totals and top-K rankings for the dashboard."""
+
+    def __init__(self, k=5):
+        self._k = k
+        self.reset()
+
+    def reset(self):
+        # Flight numbers need not be unique, so flights are ranked by id(flight)
+        self._fullest_flights = TopK(self._k)
+        self._flight_numbers = {}  # id(flight) -> flight number
+        self._busiest_routes = TopK(self._k)
+        self._active_passengers = TopK(self._k)
+        self._total_flights = 0
+        self._total_capacity = 0
+        self._total_booked = 0
+
+    def rebuild(self, flights):
+        # Count everything in plain dicts first, then heapify each ranking once
+        self.reset()
+        loads, routes, passengers = {}, {}, {}
+        for flight in flights:
+            booked = flight.get_booked_count()
+            capacity = flight.get_capacity()
+            self._total_flights += 1
+            self._total_capacity += capacity
+            self._total_booked += booked
+            loads[id(flight)] = booked / capacity if capacity > 0 else 0.0
+            self._flight_numbers[id(flight)] = flight.get_flight_number()
+            if booked:
+                route = (flight.get_origin(), flight.get_destination())
+                routes[route] = routes.get(route, 0) + booked
+            for username in flight.get_passenger_usernames():
+                passengers[username] = passengers.get(username, 0) + 1
+        self._fullest_flights.load(loads)
+        self._busiest_routes.load(routes)
+        self._active_passengers.load(passengers)
+
+    # -------------------------
+    # Event hooks (called by System)
+    # -------------------------
+    def on_flight_added(self, flight):
+        booked = flight.get_booked_count()
+        self._total_flights += 1
+        self._total_capacity += flight.get_capacity()
+        self._total_booked += booked
+        self._update_flight(flight)
+        self._change_route(flight, booked)
+        for username in flight.get_passenger_usernames():
+            self._change_passenger(username, 1)
+
+    def on_flight_removed(self, flight):
+        booked = flight.get_booked_count()
+        self._total_flights -= 1
+        self._total_capacity -= flight.get_capacity()
+        self._total_booked -= booked
+        self._fullest_flights.remove(id(flight))
+        self._flight_numbers.pop(id(flight), None)
+        self._change_route(flight, -booked)
+        for username in flight.get_passenger_usernames():
+            self._change_passenger(username, -1)
+
+    def on_booking(self, flight, passenger):
+        self._total_booked += 1
+        self._update_flight(flight)
+        self._change_route(flight, 1)
+        self._change_passenger(passenger.get_username(), 1)
+
+    def on_cancellation(self, flight, passenger):
+        self._total_booked -= 1
+        self._update_flight(flight)
+        self._change_route(flight, -1)
+        self._change_passenger(passenger.get_username(), -1)
+
+    # -------------------------
+    # Queries
+    # -------------------------
+    def get_stats(self):
+        return {
+            "total_flights": self._total_flights,
+            "total_capacity": self._total_capacity,
+            "total_booked": self._total_booked,
+            "available_seats": self._total_capacity - self._total_booked,
+            "fullest_flights": [
+                {"number": self._flight_numbers[key], "load_factor": round(load, 4)}
+                for key, load in self._fullest_flights.top()
+            ],
+            "busiest_routes": [
+                {"origin": route[0], "destination": route[1], "bookings": count}
+                for route, count in self._busiest_routes.top()
+            ],
+            "active_passengers": [
+                {"username": username, "bookings": count}
+                for username, count in self._active_passengers.top()
+            ],
+        }
+
+    # -------------------------
+    # Internal helpers
+    # -------------------------
+    def _update_flight(self, flight):
+        capacity = flight.get_capacity()
+        booked = flight.get_booked_count()
+        load = booked / capacity if capacity > 0 else 0.0
+        self._flight_numbers[id(flight)] = flight.get_flight_number()
+        self._fullest_flights.update(id(flight), load)
+
+    def _change_route(self, flight, delta):
+        if delta == 0:
+            return
+        route = (flight.get_origin(), flight.get_destination())
+        self._change(self._busiest_routes, route, delta)
+
+    def _change_passenger(self, username, delta):
+        self._change(self._active_passengers, username, delta)
+
+    @staticmethod
+    def _change(ranking, key, delta):
+        count = ranking.get_score(key) + delta
+        if count > 0:
+            ranking.update(key, count)
+        else:
+            ranking.remove(key)
@@ -0,0 +1,70 @@
+"""
+Booking throughput benchmark for the sharded System.
+Throughput is measured with persistence turned off, so it shows how the
+booking work scales across shard processes; a second run with periodic
+saves reports what saving costs on top of that.
+Run: python bench_shards.py [max_shards] [bookings]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flights import Flight
+from passenger import Passenger
+from sharding import ShardedSystem
+
+FLIGHT_COUNT = 200
+PASSENGER_COUNT = 8
+CLIENT_THREADS = 16
+
+
+def run(shard_count, booking_count, passengers, persist):
+    # A future departure, or the scheduler would close booking on every flight
+    departure = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d 09:00")
+    with tempfile.TemporaryDirectory() as data_dir:
+        with ShardedSystem(shard_count, data_dir, persist=persist) as system:
+            for i in range(FLIGHT_COUNT):
+                system.add_flight(Flight(f"BM{i:04d}", "Hong Kong", "Tokyo",
+                                         departure, booking_count, "Airbus A350"))
+            for p in passengers:
+                system.register_user(p)
+
+            # Distinct (passenger, flight) pairs; main() caps booking_count so none repeat
+            jobs = [(passengers[n % len(passengers)].get_username(), f"BM{n // len(passengers):04d}")
+                    for n in range(booking_count)]
+            start = time.perf_counter()
+            with ThreadPoolExecutor(CLIENT_THREADS) as pool:
+                results = list(pool.map(lambda job: system.book_flight(*job), jobs))
+            elapsed = time.perf_counter() - start
+            system.flush()  # include the final save in the save cost
+            save_stats = system.get_save_stats()
+    ok = sum(r == "Booking successful" for r in results)
+    return ok, elapsed, save_stats
+
+
+def main():
+    max_shards = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 4)
+    booking_count = int(sys.argv[2]) if len(sys.argv) > 2 else 1600
+    if booking_count > FLIGHT_COUNT * PASSENGER_COUNT:
+        booking_count = FLIGHT_COUNT * PASSENGER_COUNT
+        print(f"bookings capped at {booking_count}, one per (passenger, flight) pair")
+    passengers = [Passenger(f"bench{i}", f"Bench {i}", f"bench{i}@example.com", "bench")
+                  for i in range(PASSENGER_COUNT)]
+
+    print(f"{'shards':>6} {'bookings':>9} {'seconds':>9} {'bookings/s':>11}"
+          f" {'saved b/s':>10} {'saves':>6} {'save s':>7}")
+    for shard_count in range(1, max_shards + 1):
+        ok, elapsed, _ = run(shard_count, booking_count, passengers, persist=False)
+        saved_ok, saved_elapsed, saves = run(shard_count, booking_count, passengers, persist=True)
+        print(f"{shard_count:>6} {ok:>9} {elapsed:>9.3f} {ok / elapsed:>11.1f}"
+              f" {saved_ok / saved_elapsed:>10.1f} {saves['saves']:>6} {saves['seconds']:>7.3f}")
+    if (os.cpu_count() or 1) < max_shards:
+        print(f"note: only {os.cpu_count()} CPU(s), shards beyond that share cores")
+
+
+if __name__ == "__main__":
+    main()
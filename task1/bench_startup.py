@@ -0,0 +1,111 @@
+"""
+Startup timing harness for the GUI backend.
+Measures, in a fresh interpreter, the time from process start until the
+window could be created, for two arms:
+  eager - the loader as it was before lazy startup: bcrypt and pywebview
+          imported up front, every user rebuilt through the constructor
+          (which bcrypt-hashed a placeholder password before the stored
+          hash replaced it) and every passenger list resolved at load;
+  lazy  - the current gui.Api startup.
+Run: python bench_startup.py [flights ...]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPEATS = 3
+EAGER_REPEATS = 1  # dominated by bcrypt, so repeating only adds minutes
+USERS_PER_FLIGHT = 0.5
+BOOKINGS_PER_FLIGHT = 20
+
+LAZY_CHILD = """
+import sys, time
+start = time.perf_counter()
+sys.path.insert(0, {here!r})
+import gui
+api = gui.Api({data!r}, archive_file={archive!r})
+try:
+    import webview
+except ImportError:
+    pass
+print(time.perf_counter() - start)
+"""
+
+EAGER_CHILD = """
+import sys, time
+start = time.perf_counter()
+sys.path.insert(0, {here!r})
+import json
+import bcrypt
+try:
+    import webview
+except ImportError:
+    pass
+from flights import Flight
+from passenger import Passenger
+with open({data!r}, "r", encoding="utf-8") as f:
+    data = json.load(f)
+users_map = {{}}
+for u in data["users"]:
+    user = Passenger(u["username"], u["name"], u["email"], "placeholder")
+    user.set_password_hash(u["password_hash"])
+    users_map[user.get_username()] = user
+flights = [Flight.from_dict(fd, users_map) for fd in data["flights"]]
+for flight in flights:
+    flight.get_passenger_list()
+print(time.perf_counter() - start)
+"""
+
+
+def make_dataset(path, flight_count):
+    import bcrypt
+    # One real hash reused for every user; hashing each would dominate setup
+    password_hash = bcrypt.hashpw(b"bench", bcrypt.gensalt(4)).decode("utf-8")
+    user_count = max(BOOKINGS_PER_FLIGHT, int(flight_count * USERS_PER_FLIGHT))
+    # Future departures, so the scheduler has nothing to archive during startup
+    first_day = datetime.now() + timedelta(days=1)
+    users = [{"type": "Passenger", "username": f"user{i}", "name": f"User {i}",
+              "email": f"user{i}@example.com", "password_hash": password_hash}
+             for i in range(user_count)]
+    flights = [{"flight_number": f"SB{i:05d}", "origin": f"City{i % 40}",
+                "destination": f"City{(i * 7 + 1) % 40}",
+                "departure_time": (first_day + timedelta(days=i % 365)).strftime("%Y-%m-%d 08:00"),
+                "capacity": 200, "aircraft": "Airbus A320",
+                "booked_passengers": [f"user{(i + j) % user_count}" for j in range(BOOKINGS_PER_FLIGHT)]}
+               for i in range(flight_count)]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"users": users, "flights": flights}, f, indent=2, ensure_ascii=False)
+
+
+def time_startup(child, data_file, repeats):
+    # Best of `repeats` cold interpreter starts
+    archive_file = os.path.join(os.path.dirname(data_file), "archive.jsonl")
+    code = child.format(here=HERE, data=data_file, archive=archive_file)
+    times = []
+    for _ in range(repeats):
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        times.append(float(out.stdout.strip().splitlines()[-1]))
+    return min(times)
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [100, 1000]
+    print(f"{'flights':>8} {'users':>6} {'eager (s)':>10} {'lazy (s)':>10} {'speed-up':>9}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            data_file = os.path.join(tmp, "data.json")
+            make_dataset(data_file, size)
+            user_count = max(BOOKINGS_PER_FLIGHT, int(size * USERS_PER_FLIGHT))
+            eager_time = time_startup(EAGER_CHILD, data_file, EAGER_REPEATS)
+            lazy_time = time_startup(LAZY_CHILD, data_file, REPEATS)
+        print(f"{size:>8} {user_count:>6} {eager_time:>10.3f} {lazy_time:>10.3f} "
+              f"{eager_time / lazy_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
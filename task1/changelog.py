@@ -0,0 +1,84 @@
+"""
+Sequenced change log for the Flight Booking System.
+Every flight, seat-count and booking change gets a sequence number so
+the GUI can ask for "everything since seq N" instead of reloading.
+"""
+
+from collections import deque
+
+
+def flight_summary(flight):
+    """The flight fields shown in the GUI tables."""
+    return {
+        "number": flight.get_flight_number(),
+        "origin": flight.get_origin(),
+        "destination": flight.get_destination(),
+        "departure": flight.get_departure_time(),
+        "aircraft": flight.get_aircraft(),
+        "seats": flight.get_available_seats(),
+        "open": flight.is_booking_open(),
+    }
+
+
+class ChangeLog:
+    """Bounded, append-only list of change entries."""
+
+    def __init__(self, max_entries=1000):
+        self._entries = deque(maxlen=max_entries)
+        self._seq = 0
+        self._floor = 0  # oldest seq a client may still sync from
+
+    def get_seq(self):
+        return self._seq
+
+    def reset(self):
+        # Drops history and moves past every seq handed out so far, so each
+        # existing client (even one fully synced) has to reload once
+        self._entries.clear()
+        self._seq += 1
+        self._floor = self._seq
+
+    # -------------------------
+    # Recording
+    # -------------------------
+    def flight_changed(self, flight):
+        self._append({"kind": "flight", "op": "upsert", "number": flight.get_flight_number(),
+                      "flight": flight_summary(flight)})
+
+    def flight_removed(self, flight_number):
+        self._append({"kind": "flight", "op": "remove", "number": flight_number})
+
+    def seats_changed(self, flight):
+        self._append({"kind": "seats", "number": flight.get_flight_number(),
+                      "seats": flight.get_available_seats()})
+
+    def booking_added(self, flight, passenger):
+        self._append({"kind": "booking", "op": "add", "number": flight.get_flight_number(),
+                      "username": passenger.get_username()})
+
+    def booking_removed(self, flight, passenger):
+        self._append({"kind": "booking", "op": "remove", "number": flight.get_flight_number(),
+                      "username": passenger.get_username()})
+
+    def _append(self, entry):
+        if len(self._entries) == self._entries.maxlen:
+            self._floor = self._entries[0]["seq"]
+        self._seq += 1
+        entry["seq"] = self._seq
+        self._entries.append(entry)
+
+    # -------------------------
+    # Reading
+    # -------------------------
+    def get_changes_since(self, seq):
+        """Entries newer than `seq`, or None when the client must resync."""
+        if seq < self._floor or seq > self._seq:
+            return None
+        changes = []
+        # Walk back from the newest entry so the cost is O(number of changes)
+        for entry in reversed(self._entries):
+            if entry["seq"] <= seq:
+                break
+            changes.append(entry)
+        changes.reverse()
+        return changes
@@ -1,40 +1,145 @@
+import functools
 import json
+import logging
 import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
 from flights import Flight
 from passenger import Passenger
 from admin import Admin
+from analytics import BookingAnalytics
+from changelog import ChangeLog
+from snapshot import SystemSnapshot
+from scheduler import ARCHIVE, CLOSE_BOOKING, FlightArchive, FlightScheduler, parse_departure
+
+
+INVALID_TIME_MSG = "Invalid departure time (use YYYY-MM-DD HH:MM)"
+
+
+def _writer(method):
+    # Serialise writers and publish a new snapshot when the outermost write ends
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.batch():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class _UserDirectory:
+    """
+    Username -> user mapping that only builds user objects on first lookup.
+    Lookups can come from any thread, so building holds the System write lock.
+    """
+
+    def __init__(self, records, lock):
+        self._records = records
+        self._lock = lock
+        self._names = {r["username"] for r in records}
+        self._users = None
+        self._users_map = None
+
+    def __contains__(self, username):
+        return username in self._names
+
+    def __getitem__(self, username):
+        self.get_users()
+        return self._users_map[username]
+
+    def get_users(self):
+        with self._lock:
+            if self._users is None:
+                users = []
+                users_map = {}
+                for u in self._records:
+                    if u["type"] == "Admin":
+                        user = Admin.from_dict(u)
+                    else:
+                        user = Passenger.from_dict(u)
+                    users.append(user)
+                    users_map[user.get_username()] = user
+                # Publish only complete results; _users is the "built" flag
+                self._users_map = users_map
+                self._users = users
+            return self._users
 
 
 class System:
 
-    def __init__(self):
+    def __init__(self, archive_file=None):
         self._flights = []
         self._users = []
+        self._user_directory = None  # set after a load until users are first needed
+        self._analytics = BookingAnalytics()
+        self._changes = ChangeLog()
+        self._scheduler = FlightScheduler()
+        self._archive = FlightArchive(archive_file)
+        self._schedule_changed = threading.Event()  # wakes a thread waiting for the next job
+        self._columns = None  # (snapshot version, FlightColumns) of the last report export
+
+        # Copy-on-write snapshot state
+        self._write_lock = threading.RLock()
+        self._batch_depth = 0
+        self._snapshot = SystemSnapshot()
+        self._dirty_flights = {}   # flight key -> Flight
+        self._removed_keys = set()
+        self._order_dirty = False
+        self._dirty_users = []
 
     # -------------------------
     # User Management
     # -------------------------
+    @_writer
     def register_user(self, user):
-        self._users.append(user)
+        self._get_users().append(user)
+        self._dirty_users.append(user)
         return "User registered successfully"
 
     def get_all_users(self):
-        return self._users
+        return self._get_users()
+
+    def _get_users(self):
+        # Api.login/register read users without a write batch
+        with self._write_lock:
+            if self._user_directory is not None:
+                self._users = self._user_directory.get_users()
+                self._user_directory = None
+            return self._users
 
     # -------------------------
     # Flight Management
     # -------------------------
+    @_writer
     def add_flight(self, flight):
+        # The scheduler can only close and archive flights whose time it can read
+        if parse_departure(flight.get_departure_time()) is None:
+            return INVALID_TIME_MSG
         self._flights.append(flight)
+        self._mark_flight(flight)
+        self._order_dirty = True
+        self._analytics.on_flight_added(flight)
+        self._changes.flight_changed(flight)
+        self._scheduler.schedule(flight)
+        self._schedule_changed.set()
         return "Flight added successfully"
 
+    @_writer
     def remove_flight(self, flight_number):
         for flight in self._flights:
             if flight.get_flight_number() == flight_number:
-                self._flights.remove(flight)
+                self._detach_flight(flight)
                 return "Flight removed successfully"
         return "Flight not found"
 
+    def _detach_flight(self, flight):
+        self._flights.remove(flight)
+        self._dirty_flights.pop(id(flight), None)
+        self._removed_keys.add(id(flight))
+        self._order_dirty = True
+        self._analytics.on_flight_removed(flight)
+        self._changes.flight_removed(flight.get_flight_number())
+        self._scheduler.unschedule(flight)
+
     def get_all_flights(self):
         return self._flights
 
@@ -47,65 +152,227 @@ class System:
                 result.append(flight)
         return result
 
+    @_writer
     def update_flight_time(self, flight_number, new_time):
+        if parse_departure(new_time) is None:
+            return INVALID_TIME_MSG
         for flight in self._flights:
             if flight.get_flight_number() == flight_number:
                 flight.set_departure_time(new_time)
+                # New jobs for the new time; closes again at once if it is in the past
+                flight.reopen_booking()
+                self._scheduler.schedule(flight)
+                self._schedule_changed.set()
+                self._mark_flight(flight)
+                self._changes.flight_changed(flight)
                 return "Flight time updated"
         return "Flight not found"
 
     # -------------------------
     # Booking Logic
     # -------------------------
-    def book_flight(self, passenger, flight_number):
+    @_writer
+    def book_flight(self, passenger, flight_number, seat=None, fare_class=None):
         for flight in self._flights:
             if flight.get_flight_number() == flight_number:
+                if not flight.is_booking_open():
+                    return "Booking closed"
                 if passenger in flight.get_passenger_list():
                     return "You have booked the flight already"
-                if flight.add_passenger(passenger):
+                if flight.add_passenger(passenger, seat, fare_class):
+                    self._booked(flight, passenger)
                     return "Booking successful"
+                if seat is not None:
+                    return "Seat not available"
                 return "No available seats"
         return "Flight not found"
 
+    @_writer
+    def book_group(self, passengers, flight_number, fare_class=None):
+        if not passengers:
+            return "Group has no passengers"
+        if len({p.get_username() for p in passengers}) != len(passengers):
+            return "Passenger listed twice in group"
+        for flight in self._flights:
+            if flight.get_flight_number() == flight_number:
+                if not flight.is_booking_open():
+                    return "Booking closed"
+                if flight.get_seat_map() is None:
+                    return "Flight has no seat map"
+                if any(p in flight.get_passenger_list() for p in passengers):
+                    return "You have booked the flight already"
+                if flight.add_group(passengers, fare_class) is None:
+                    return "No adjacent seats available"
+                for passenger in passengers:
+                    self._booked(flight, passenger)
+                return "Booking successful"
+        return "Flight not found"
+
+    def _booked(self, flight, passenger):
+        self._mark_flight(flight)
+        self._analytics.on_booking(flight, passenger)
+        self._changes.seats_changed(flight)
+        self._changes.booking_added(flight, passenger)
+
+    @_writer
     def cancel_booking(self, passenger, flight_number):
         for flight in self._flights:
             if flight.get_flight_number() == flight_number:
+                if not flight.is_booking_open():
+                    return "Booking closed"
                 if flight.remove_passenger(passenger):
+                    self._mark_flight(flight)
+                    self._analytics.on_cancellation(flight, passenger)
+                    self._changes.seats_changed(flight)
+                    self._changes.booking_removed(flight, passenger)
                     return "Booking cancelled"
                 return "Passenger not booked on this flight"
 
         return "Flight not found"
 
+    # -------------------------
+    # Scheduled Jobs
+    # -------------------------
+    def get_next_job_time(self):
+        # get_next_due drops stale heap entries, so it is a write
+        with self._write_lock:
+            return self._scheduler.get_next_due()
+
+    def wait_for_schedule_change(self, timeout):
+        """Sleep up to `timeout` seconds; returns early once a flight is (re)scheduled."""
+        changed = self._schedule_changed.wait(timeout)
+        self._schedule_changed.clear()
+        return changed
+
+    def run_due_jobs(self, now=None):
+        """Run every job due by `now`; returns how many ran."""
+        now = now or datetime.now()
+        departed = []
+        with self.batch():
+            jobs = self._scheduler.pop_due(now)
+            for job, flight in jobs:
+                if job == CLOSE_BOOKING:
+                    flight.close_booking()
+                    self._mark_flight(flight)
+                    self._changes.flight_changed(flight)
+                elif job == ARCHIVE:
+                    # Departed: keep the record and bookings, drop it from the live schedule
+                    departed.append(self._archive.make_record(flight, now))
+                    self._detach_flight(flight)
+        # File I/O after the lock is released. If the process dies before the
+        # next save, the flight is archived again on restart and skipped as known.
+        self._archive.add(departed)
+        return len(jobs)
+
+    def get_archived_flights(self):
+        return self._archive.get_records()
+
+    # -------------------------
+    # Snapshots
+    # -------------------------
+    def get_snapshot(self):
+        """The latest published snapshot; safe to read without any lock."""
+        return self._snapshot
+
+    @contextmanager
+    def batch(self):
+        """Group several writes so readers only see them all at once."""
+        with self._write_lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._publish()
+
+    def _mark_flight(self, flight):
+        # Flights are keyed by id() because flight numbers are not guaranteed unique
+        self._dirty_flights[id(flight)] = flight
+
+    def _publish(self):
+        if not (self._dirty_flights or self._removed_keys or self._order_dirty or self._dirty_users):
+            return
+        order = tuple(id(f) for f in self._flights) if self._order_dirty else None
+        # Rebinding one attribute is atomic, so readers see the old or the new version
+        self._snapshot = self._snapshot.evolve(self._dirty_flights, self._removed_keys,
+                                               order, self._dirty_users)
+        self._dirty_flights = {}
+        self._removed_keys = set()
+        self._order_dirty = False
+        self._dirty_users = []
+
+    # -------------------------
+    # Change Feed
+    # -------------------------
+    def get_change_seq(self):
+        return self._changes.get_seq()
+
+    def get_changes_since(self, seq):
+        """(changes after seq or None for a resync, latest seq), read under one lock."""
+        # Writers (including the scheduler thread) append to the same deque
+        with self._write_lock:
+            return self._changes.get_changes_since(seq), self._changes.get_seq()
+
+    # -------------------------
+    # Analytics
+    # -------------------------
+    def get_dashboard_stats(self):
+        # TopK.top() reshuffles the shared heaps, so it must not race a writer
+        with self._write_lock:
+            return self._analytics.get_stats()
+
+    def export_columns(self):
+        """NumPy columns of the current snapshot, rebuilt only after a write."""
+        snapshot = self._snapshot
+        cached = self._columns
+        if cached is None or cached[0] != snapshot.get_version():
+            from reports import FlightColumns  # pulls in NumPy, so only when reporting
+            cached = (snapshot.get_version(), FlightColumns(list(snapshot.get_all_flights())))
+            self._columns = cached
+        return cached[1]
+
     # -------------------------
     # JSON Persistence
     # -------------------------
     def save_to_json(self, filepath):
-        data = {
-            "users": [u.to_dict() for u in self._users],
-            "flights": [f.to_dict() for f in self._flights],
-        }
+        # Serialise a published snapshot so writers are never blocked
+        data = self._snapshot.to_dict()
         with open(filepath, "w", encoding="utf-8") as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
 
+    @_writer
     def load_from_json(self, filepath):
         if not os.path.exists(filepath):
             return False
         with open(filepath, "r", encoding="utf-8") as f:
             data = json.load(f)
+        self._load_data(data)
+        return True
 
+    def _load_data(self, data):
+        # Users stay as plain dicts until someone needs the objects (e.g. login)
+        records = data.get("users", [])
         self._users = []
-        users_map = {}
-        for u in data.get("users", []):
-            if u["type"] == "Admin":
-                user = Admin.from_dict(u)
-            else:
-                user = Passenger.from_dict(u)
-            self._users.append(user)
-            users_map[user.get_username()] = user
+        self._user_directory = _UserDirectory(records, self._write_lock)
 
         self._flights = []
         for fd in data.get("flights", []):
-            flight = Flight.from_dict(fd, users_map)
+            flight = Flight.from_dict(fd, self._user_directory, self._write_lock)
             self._flights.append(flight)
+        self._analytics.rebuild(self._flights)
+        self._changes.reset()
+        for flight in self._scheduler.rebuild(self._flights):
+            # Accepted before times were validated; such flights never close on their own
+            logging.warning("Flight %s has an unreadable departure time %r and will not be "
+                            "closed or archived automatically",
+                            flight.get_flight_number(), flight.get_departure_time())
+        self._schedule_changed.set()
 
-        return True
+        # Start a fresh snapshot from the loaded state
+        self._snapshot = SystemSnapshot(self._snapshot.get_version(),
+                                        users={r["username"]: r for r in records})
+        self._dirty_flights = {id(f): f for f in self._flights}
+        self._removed_keys = set()
+        self._order_dirty = True
+        self._dirty_users = []
@@ -1,6 +1,11 @@
+from contextlib import nullcontext
+
+from seatmap import SeatMap
+
+
 class Flight:
     def __init__(self, flight_number, origin, 
-                 destination, departure_time, capacity, aircraft):
+                 destination, departure_time, capacity, aircraft, seat_map=None):
         # encapsulation
         self._flight_number = flight_number
         self._origin = origin
@@ -8,7 +13,17 @@ class Flight:
         self._departure_time = departure_time
         self._capacity = capacity
         self._booked_passengers = []
+        self._booked_count = 0
+        # (usernames, users_map) waiting to be resolved after a lazy load
+        self._pending_passengers = None
+        self._resolve_lock = None  # the owning System's write lock, if any
         self._aircraft = aircraft
+        # Optional seat-level inventory; capacity then comes from the seat map
+        self._seat_map = seat_map
+        self._seat_assignments = {}  # username -> seat label
+        self._booking_open = True
+        if seat_map is not None:
+            self._capacity = seat_map.get_total_seats()
 
     # -------------------------
     # Getter methods
@@ -26,14 +41,43 @@ class Flight:
         return self._departure_time
 
     def get_available_seats(self):
-        return self._capacity - len(self._booked_passengers)
+        return self._capacity - self._booked_count
+
+    def get_booked_count(self):
+        return self._booked_count
 
     def get_passenger_list(self):
+        self._resolve_passengers()
         return self._booked_passengers
     
     def get_aircraft(self):
         return self._aircraft
 
+    def is_booking_open(self):
+        return self._booking_open
+
+    def close_booking(self):
+        self._booking_open = False
+
+    def reopen_booking(self):
+        self._booking_open = True
+
+    def get_passenger_usernames(self):
+        # Answered from the pending usernames when possible, without resolving users
+        pending = self._pending_passengers
+        if pending is not None:
+            return list(pending[0])
+        return [p.get_username() for p in self._booked_passengers]
+
+    def get_seat_map(self):
+        return self._seat_map
+
+    def get_seat(self, passenger):
+        return self._seat_assignments.get(passenger.get_username())
+
+    def get_seat_assignments(self):
+        return self._seat_assignments
+
     # -------------------------
     # Setter
     # -------------------------
@@ -50,7 +94,9 @@ class Flight:
         self._destination = new_dest
 
     def update_capacity(self, new_capacity):
-        if new_capacity < len(self._booked_passengers):
+        if self._seat_map is not None:
+            return "Capacity is set by the seat map"
+        if new_capacity < self._booked_count:
             return "Cannot reduce capacity below current bookings"
         self._capacity = new_capacity
         return "Capacity updated"
@@ -62,17 +108,62 @@ class Flight:
     # Booking logic
     # -------------------------
     def get_passenger_list(self):
+        self._resolve_passengers()
         return self._booked_passengers
     
-    def add_passenger(self, passenger):
-        if self.get_available_seats() > 0:
-            self._booked_passengers.append(passenger)
-            return True
-        return False
+    def add_passenger(self, passenger, seat=None, fare_class=None):
+        if self.get_available_seats() <= 0:
+            return False
+        self._resolve_passengers()
+        if self._seat_map is None:
+            if seat is not None:
+                return False  # no seat map, so a specific seat cannot be promised
+        else:
+            if seat is None:
+                # No seat chosen: take the first free one in the requested cabin
+                free = self._seat_map.find_adjacent(1, fare_class)
+                if free is None:
+                    return False
+                seat = free[0]
+            try:
+                if fare_class is not None and self._seat_map.get_fare_class(seat) != fare_class:
+                    return False
+                if not self._seat_map.take(seat):
+                    return False
+            except ValueError:  # seat label does not exist on this aircraft
+                return False
+            self._seat_assignments[passenger.get_username()] = seat.strip().upper()
+        self._booked_passengers.append(passenger)
+        self._booked_count += 1
+        return True
+
+    def add_group(self, passengers, fare_class=None):
+        """Seat a group side by side. Returns the seat labels, or None."""
+        if self._seat_map is None or len(passengers) > self.get_available_seats():
+            return None
+        usernames = {p.get_username() for p in passengers}
+        if not passengers or len(usernames) != len(passengers):
+            return None  # empty group, or the same passenger listed twice
+        seats = self._seat_map.find_adjacent(len(passengers), fare_class)
+        if seats is None:
+            return None
+        for passenger, seat in zip(passengers, seats):
+            self.add_passenger(passenger, seat)
+        return seats
+
+    def is_seat_available(self, seat):
+        if self._seat_map is None:
+            return False
+        return self._seat_map.is_available(seat)
 
     def remove_passenger(self, passenger):
+        self._resolve_passengers()
         if passenger in self._booked_passengers:
             self._booked_passengers.remove(passenger)
+            self._booked_count -= 1
+            seat = self._seat_assignments.pop(passenger.get_username(), None)
+            if seat is not None:
+                self._seat_map.release(seat)
             return True
         return False
 
@@ -80,18 +171,22 @@ class Flight:
         return self._capacity
 
     def to_dict(self):
-        return {
+        data = {
             "flight_number": self._flight_number,
             "origin": self._origin,
             "destination": self._destination,
             "departure_time": self._departure_time,
             "capacity": self._capacity,
             "aircraft": self._aircraft,
-            "booked_passengers": [p.get_username() for p in self._booked_passengers],
+            "booked_passengers": self.get_passenger_usernames(),
         }
+        if self._seat_map is not None:
+            data["seat_map"] = self._seat_map.to_dict()
+            data["seat_assignments"] = dict(self._seat_assignments)
+        return data
 
     @classmethod
-    def from_dict(cls, data, users_map):
+    def from_dict(cls, data, users_map, lock=None):
         flight = cls(
             data["flight_number"],
             data["origin"],
@@ -100,11 +195,33 @@ class Flight:
             data["capacity"],
             data["aircraft"],
         )
-        for username in data.get("booked_passengers", []):
-            if username in users_map:
-                flight._booked_passengers.append(users_map[username])
+        if "seat_map" in data:
+            flight._seat_map = SeatMap.from_dict(data["seat_map"])
+            flight._capacity = flight._seat_map.get_total_seats()
+            flight._seat_assignments = dict(data.get("seat_assignments", {}))
+        # Only check the names now; Passenger objects are looked up on first access
+        usernames = [u for u in data.get("booked_passengers", []) if u in users_map]
+        flight._booked_count = len(usernames)
+        if usernames:
+            flight._pending_passengers = (usernames, users_map)
+            flight._resolve_lock = lock
         return flight
 
+    def _resolve_passengers(self):
+        if self._pending_passengers is None:
+            return
+        # Readers may resolve while a writer books on this flight, so take
+        # the writer's lock and re-check once holding it
+        with self._resolve_lock or nullcontext():
+            pending = self._pending_passengers
+            if pending is None:
+                return
+            usernames, users_map = pending
+            # Clear the pending names only once the list is complete, so a
+            # failed lookup never leaves the flight empty
+            self._booked_passengers = [users_map[u] for u in usernames]
+            self._pending_passengers = None
+
     def __str__(self):
         return (f"Flight: {self._flight_number} | "
                 f"{self._origin} → {self._destination} | "
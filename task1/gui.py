@@ -3,16 +3,23 @@ Modern GUI for Flight Booking System using PyWebView.
 Run this file to launch the application.
 """
 
-import webview
 import json
+import logging
 import os
+import threading
+from datetime import datetime, timedelta
 from flight_system import System
 from flights import Flight
 from passenger import Passenger
 from admin import Admin
+from changelog import flight_summary
 import time
 
+# webview, bcrypt and numpy are imported on first use to keep startup fast
 DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data.json")
+ARCHIVE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "archive.jsonl")
+SCHEDULER_MAX_SLEEP = 60  # seconds; also picks up jobs added while sleeping
+REPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reports")
 
 # =========================================================
 # Backend API – exposed to JavaScript via pywebview bridge
@@ -20,25 +27,55 @@ DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data.json"
 class Api:
     """Bridge between the HTML/JS frontend and the Python backend."""
 
-    def __init__(self):
-        self.system = System()
+    def __init__(self, data_file=DATA_FILE, archive_file=ARCHIVE_FILE):
+        self.system = System(archive_file)
         self.current_user = None
-        if not self.system.load_from_json(DATA_FILE):
+        self._data_file = data_file
+        self._save_lock = threading.Lock()
+        if not self.system.load_from_json(data_file):
             self._seed_demo_data()
             self._save()
 
+        # Close and archive anything that departed while the app was not running
+        if self.system.run_due_jobs():
+            self._save()
+        threading.Thread(target=self._scheduler_loop, daemon=True).start()
+
     # ----- helpers -----
     def _save(self):
-        self.system.save_to_json(DATA_FILE)
+        # The scheduler thread saves too, so writes to data.json are serialised
+        with self._save_lock:
+            self.system.save_to_json(self._data_file)
+
+    def _scheduler_loop(self):
+        """Sleep until the next departure job is due, run it, save."""
+        while True:
+            try:
+                next_time = self.system.get_next_job_time()
+                wait = SCHEDULER_MAX_SLEEP
+                if next_time is not None:
+                    wait = min(wait, max((next_time - datetime.now()).total_seconds(), 0))
+                # Added or retimed flights cut the sleep short
+                self.system.wait_for_schedule_change(wait)
+                if self.system.run_due_jobs():
+                    self._save()
+            except Exception:
+                # Keep the thread alive; otherwise no flight would ever close again
+                logging.exception("Scheduled flight jobs failed")
+                time.sleep(SCHEDULER_MAX_SLEEP)
 
     def _seed_demo_data(self):
         """Pre-populate some flights so the UI is not empty on first run."""
+        # Dates are relative to today so the scheduler does not archive them straight away
+        def day(offset):
+            return (datetime.now() + timedelta(days=offset)).strftime("%Y-%m-%d")
+
         demo_flights = [
-            Flight("CA1001", "Beijing",    "Shanghai",   "2026-03-15 08:00", 120, "Airbus A319"),
-            Flight("MU2045", "Guangzhou",  "Chengdu",    "2026-03-16 10:30", 150, "Airbus A320"),
-            Flight("CZ3521", "Shenzhen",   "Hangzhou",   "2026-03-17 14:00", 80, "C909"),
-            Flight("HU7890", "Shanghai",   "Beijing",    "2026-03-18 18:45", 220, "Boeing 787-9"),
-            Flight("FM9101", "Chengdu",    "Kunming",    "2026-03-19 07:15", 120, "Boeing 737-700"),
+            Flight("CA1001", "Beijing",    "Shanghai",   f"{day(7)} 08:00", 120, "Airbus A319"),
+            Flight("MU2045", "Guangzhou",  "Chengdu",    f"{day(8)} 10:30", 150, "Airbus A320"),
+            Flight("CZ3521", "Shenzhen",   "Hangzhou",   f"{day(9)} 14:00", 80, "C909"),
+            Flight("HU7890", "Shanghai",   "Beijing",    f"{day(10)} 18:45", 220, "Boeing 787-9"),
+            Flight("FM9101", "Chengdu",    "Kunming",    f"{day(11)} 07:15", 120, "Boeing 737-700"),
         ]
         for f in demo_flights:
             self.system.add_flight(f)
@@ -89,18 +126,65 @@ class Api:
 
     # ---------- Flights (read) ----------
     def get_flights(self):
-        flights = self.system.get_all_flights()
+        flights = self.system.get_snapshot().get_all_flights()
         return json.dumps([self._flight_dict(f) for f in flights])
 
     def search_flights(self, keyword):
-        flights = self.system.search_flight(keyword)
+        flights = self.system.get_snapshot().search_flight(keyword)
         return json.dumps([self._flight_dict(f) for f in flights])
 
+    def get_dashboard_stats(self):
+        if not self._is_admin():
+            return json.dumps({"ok": False, "msg": "Permission denied"})
+        stats = self.system.get_dashboard_stats()
+        stats["ok"] = True
+        return json.dumps(stats)
+
+    def get_capacity_report(self, group_by):
+        from reports import GROUP_KEYS
+        if not self._is_admin():
+            return json.dumps({"ok": False, "msg": "Permission denied"})
+        if group_by not in GROUP_KEYS:
+            return json.dumps({"ok": False, "msg": "Unknown report grouping"})
+        rows = self.system.export_columns().load_factor_report(group_by)
+        return json.dumps({"ok": True, "rows": rows})
+
+    def export_capacity_report(self, group_by):
+        from reports import GROUP_KEYS, write_report_csv
+        if not self._is_admin():
+            return json.dumps({"ok": False, "msg": "Permission denied"})
+        if group_by not in GROUP_KEYS:
+            return json.dumps({"ok": False, "msg": "Unknown report grouping"})
+        rows = self.system.export_columns().load_factor_report(group_by)
+        os.makedirs(REPORT_DIR, exist_ok=True)
+        filepath = os.path.join(REPORT_DIR, f"load_factor_by_{group_by}.csv")
+        write_report_csv(rows, filepath)
+        return json.dumps({"ok": True, "msg": f"Report saved to {filepath}"})
+
+    def get_change_seq(self):
+        """Current change-feed position, where a freshly rendered view starts syncing."""
+        return json.dumps({"ok": True, "seq": self.system.get_change_seq()})
+
+    def get_changes_since(self, seq):
+        """Deltas after `seq`, or a resync request when history was dropped."""
+        try:
+            seq = int(seq)
+        except (TypeError, ValueError):
+            return json.dumps({"ok": False, "msg": "Invalid sequence number"})
+        changes, latest = self.system.get_changes_since(seq)
+        if changes is None:
+            return json.dumps({"ok": True, "resync": True, "seq": latest, "changes": []})
+        if not self._is_admin():
+            # Passengers only see their own booking entries
+            me = self.current_user.get_username() if self.current_user else None
+            changes = [c for c in changes if c["kind"] != "booking" or c["username"] == me]
+        return json.dumps({"ok": True, "resync": False, "seq": latest, "changes": changes})
+
     # ---------- Passenger actions ----------
-    def book_flight(self, flight_number):
+    def book_flight(self, flight_number, seat=None):
         if self.current_user is None:
             return json.dumps({"ok": False, "msg": "Not logged in"})
-        msg = self.system.book_flight(self.current_user, flight_number)
+        msg = self.system.book_flight(self.current_user, flight_number, seat)
         ok = msg == "Booking successful"
         time.sleep(0.1)
         if ok:
@@ -119,11 +203,8 @@ class Api:
     def get_my_bookings(self):
         if self.current_user is None:
             return json.dumps([])
-        result = []
-        for f in self.system.get_all_flights():
-            if self.current_user in f.get_passenger_list():
-                result.append(self._flight_dict(f))
-        return json.dumps(result)
+        bookings = self.system.get_snapshot().get_bookings(self.current_user.get_username())
+        return json.dumps([self._flight_dict(f) for f in bookings])
 
     # ---------- Admin actions ----------
     def add_flight(self, number, origin, dest, time, capacity, aircraft):
@@ -157,13 +238,16 @@ class Api:
     def get_flight_passengers(self, flight_number):
         if not self._is_admin():
             return json.dumps([])
-        for f in self.system.get_all_flights():
-            if f.get_flight_number() == flight_number:
-                return json.dumps([
-                    {"username": p.get_username(), "name": p.get_name(), "email": p.get_email()}
-                    for p in f.get_passenger_list()
-                ])
-        return json.dumps([])
+        snapshot = self.system.get_snapshot()
+        flight = snapshot.get_flight(flight_number)
+        if flight is None:
+            return json.dumps([])
+        result = []
+        for username in flight.get_passenger_usernames():
+            user = snapshot.get_user(username)
+            if user is not None:
+                result.append({"username": username, "name": user["name"], "email": user["email"]})
+        return json.dumps(result)
 
     # ---------- internal helpers ----------
     def _is_admin(self):
@@ -171,14 +255,7 @@ class Api:
 
     @staticmethod
     def _flight_dict(f):
-        return {
-            "number": f.get_flight_number(),
-            "origin": f.get_origin(),
-            "destination": f.get_destination(),
-            "departure": f.get_departure_time(),
-            "aircraft": f.get_aircraft(),
-            "seats": f.get_available_seats(),
-        }
+        return flight_summary(f)
 
 
 
@@ -186,6 +263,7 @@ class Api:
 # Application entry-point
 # =========================================================
 def main():
+    import webview
     api = Api()
     window = webview.create_window(
         title="SkyBooker – Flight Booking System",
@@ -0,0 +1,22 @@
+"""
+The heap ADTs from the task2 self-study folder, for use in task1.
+They are loaded by file path, so importing them does not touch sys.path.
+"""
+
+import importlib.util
+import os
+
+TASK2_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "task2")
+
+
+def _load_class(name):
+    # task2/<name>.py defines a class of the same name
+    path = os.path.join(TASK2_DIR, f"{name}.py")
+    spec = importlib.util.spec_from_file_location(f"task2_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return getattr(module, name)
+
+
+MinHeap = _load_class("MinHeap")
+MaxHeap = _load_class("MaxHeap")
@@ -29,8 +29,8 @@ class Passenger(Person):
     @classmethod
     def from_dict(cls, data):
         passenger = cls.__new__(cls)
-        Person.__init__(passenger, data["username"], data["name"], data["email"], "placeholder")
-        passenger.set_password_hash(data["password_hash"])
+        Person.__init__(passenger, data["username"], data["name"], data["email"], None,
+                        data["password_hash"])
         return passenger
 
     # -------------------------
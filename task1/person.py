@@ -1,21 +1,31 @@
 # it is a ADT class
 from abc import ABC, abstractmethod
 
-import bcrypt
+
+def _bcrypt():
+    # bcrypt is imported on first use so loading users does not pay for it
+    import bcrypt
+    return bcrypt
 
 
 class Person(ABC):
-    def __init__(self, username, name, email, password):
+    def __init__(self, username, name, email, password, password_hash=None):
         # encapsulation
         self._username = username
         self._name = name
         self._email = email
-        self.__password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        if password_hash is not None:
+            # Loading a stored user: keep the existing hash instead of hashing again
+            self.__password = password_hash
+        else:
+            self.set_password(password)
 
     def set_password(self, password):
+        bcrypt = _bcrypt()
         self.__password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
 
     def check_password(self, password):
+        bcrypt = _bcrypt()
         return bcrypt.checkpw(password.encode('utf-8'), self.__password.encode('utf-8'))
     
     def get_username(self):
@@ -0,0 +1,104 @@
+"""
+Columnar occupancy and capacity reports for the Flight Booking System.
+Flights are exported once into NumPy columns, then every grouped
+report is a handful of vectorised bincount calls.
+"""
+
+import csv
+
+import numpy as np
+
+
+GROUP_KEYS = ("route", "origin", "destination", "aircraft", "day")
+CSV_FIELDS = ["group", "flights", "capacity", "booked", "available", "load_factor"]
+
+
+def _categorise(values):
+    # Turn a list of strings into (categories, integer codes)
+    categories, codes = np.unique(np.array(values, dtype=object).astype(str), return_inverse=True)
+    return categories, codes.astype(np.int64)
+
+
+def _parse_departure(text):
+    # Departure times are stored as "YYYY-MM-DD HH:MM"; anything else becomes NaT
+    try:
+        return np.datetime64(text.strip().replace(" ", "T"), "m")
+    except (ValueError, AttributeError):
+        return np.datetime64("NaT", "m")
+
+
+class FlightColumns:
+    """Column-oriented copy of a list of Flight objects."""
+
+    def __init__(self, flights):
+        count = len(flights)
+        self.flight_numbers = np.array([f.get_flight_number() for f in flights], dtype=object)
+        self.capacity = np.fromiter((f.get_capacity() for f in flights), dtype=np.int64, count=count)
+        self.booked = np.fromiter((f.get_booked_count() for f in flights), dtype=np.int64, count=count)
+        self.departure = np.array([_parse_departure(f.get_departure_time()) for f in flights],
+                                  dtype="datetime64[m]")
+        self.origin_names, self.origin_codes = _categorise([f.get_origin() for f in flights])
+        self.destination_names, self.destination_codes = _categorise([f.get_destination() for f in flights])
+        self.aircraft_names, self.aircraft_codes = _categorise([f.get_aircraft() for f in flights])
+
+    def __len__(self):
+        return len(self.capacity)
+
+    # -------------------------
+    # Grouping keys
+    # -------------------------
+    def _group_codes(self, group_by):
+        # Returns (labels, codes) where codes[i] indexes into labels
+        if group_by == "origin":
+            return self.origin_names, self.origin_codes
+        if group_by == "destination":
+            return self.destination_names, self.destination_codes
+        if group_by == "aircraft":
+            return self.aircraft_names, self.aircraft_codes
+        if group_by == "route":
+            # Pack (origin, destination) into one integer so np.unique can group pairs
+            width = len(self.destination_names)
+            unique, codes = np.unique(self.origin_codes * width + self.destination_codes,
+                                      return_inverse=True)
+            origins = self.origin_names[unique // width]
+            destinations = self.destination_names[unique % width]
+            labels = np.array([f"{o} → {d}" for o, d in zip(origins, destinations)], dtype=object)
+            return labels, codes
+        if group_by == "day":
+            days = self.departure.astype("datetime64[D]")
+            labels = np.datetime_as_string(days).astype(object)
+            labels[np.isnat(days)] = "unknown"
+            return _categorise(list(labels))
+        raise ValueError(f"Unknown group key: {group_by}")
+
+    # -------------------------
+    # Reports
+    # -------------------------
+    def load_factor_report(self, group_by):
+        """Flights, capacity, bookings and load factor per group."""
+        if len(self) == 0:
+            return []
+        labels, codes = self._group_codes(group_by)
+        size = len(labels)
+        flights = np.bincount(codes, minlength=size)
+        capacity = np.bincount(codes, weights=self.capacity, minlength=size).astype(np.int64)
+        booked = np.bincount(codes, weights=self.booked, minlength=size).astype(np.int64)
+        load = np.divide(booked, capacity, out=np.zeros(size), where=capacity > 0)
+        return [
+            {
+                "group": str(labels[i]),
+                "flights": int(flights[i]),
+                "capacity": int(capacity[i]),
+                "booked": int(booked[i]),
+                "available": int(capacity[i] - booked[i]),
+                "load_factor": round(float(load[i]), 4),
+            }
+            for i in range(size)
+        ]
+
+
+def write_report_csv(rows, filepath):
+    with open(filepath, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
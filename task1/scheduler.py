@@ -0,0 +1,151 @@
+"""
+Departure-driven job scheduler for the Flight Booking System.
+Each flight gets a "close booking" job at departure and an "archive" job
+shortly after; jobs sit in a MinHeap ordered by due time, so finding the
+next due job never needs a scan over all flights.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+
+from heaps import MinHeap
+
+
+DEPARTURE_FORMAT = "%Y-%m-%d %H:%M"
+ARCHIVE_DELAY = timedelta(hours=1)
+
+CLOSE_BOOKING = "close_booking"
+ARCHIVE = "archive"
+
+
+def parse_departure(text):
+    """Departure string -> datetime, or None if it is not "YYYY-MM-DD HH:MM"."""
+    try:
+        return datetime.strptime(text.strip(), DEPARTURE_FORMAT)
+    except (ValueError, AttributeError):
+        return None
+
+
+class FlightScheduler:
+    """
+    Timer queue of flight lifecycle jobs.
+    Rescheduling does not search the heap: the flight's version is bumped
+    and older entries are skipped when they reach the top.
+    """
+
+    def __init__(self, archive_delay=ARCHIVE_DELAY):
+        self._archive_delay = archive_delay
+        self._heap = MinHeap()
+        self._versions = {}  # id(flight) -> current version
+        self._seq = 0        # tie-breaker so flights are never compared
+
+    def _entries_for(self, flight):
+        departure = parse_departure(flight.get_departure_time())
+        key = id(flight)
+        version = self._versions.get(key, 0) + 1
+        self._versions[key] = version
+        if departure is None:
+            return []
+        entries = []
+        for due, job in ((departure, CLOSE_BOOKING), (departure + self._archive_delay, ARCHIVE)):
+            self._seq += 1
+            entries.append((due, self._seq, job, version, flight))
+        return entries
+
+    def schedule(self, flight):
+        """(Re)schedule a flight's jobs. O(log n)."""
+        entries = self._entries_for(flight)
+        for entry in entries:
+            self._heap.insert(entry)
+        return bool(entries)
+
+    def unschedule(self, flight):
+        # Any queued entries become stale and are dropped when popped
+        self._versions.pop(id(flight), None)
+
+    def rebuild(self, flights):
+        """Schedule all `flights` at once; returns those whose time cannot be read."""
+        self._versions = {}
+        entries = []
+        unscheduled = []
+        for flight in flights:
+            flight_entries = self._entries_for(flight)
+            if not flight_entries:
+                unscheduled.append(flight)
+            entries.extend(flight_entries)
+        self._heap.build_heap(entries)
+        return unscheduled
+
+    def _is_live(self, entry):
+        return self._versions.get(id(entry[4])) == entry[3]
+
+    def get_next_due(self):
+        while self._heap.heap and not self._is_live(self._heap.heap[0]):
+            self._heap.extract_min()
+        return self._heap.heap[0][0] if self._heap.heap else None
+
+    def pop_due(self, now):
+        """All live jobs due at or before `now`, as (job, flight) in due order."""
+        jobs = []
+        while True:
+            due = self.get_next_due()
+            if due is None or due > now:
+                return jobs
+            _, _, job, _, flight = self._heap.extract_min()
+            if job == ARCHIVE:
+                self.unschedule(flight)
+            jobs.append((job, flight))
+
+
+class FlightArchive:
+    """
+    Departed flights with their bookings, appended as JSON lines.
+    Adding is idempotent per (flight number, departure), so re-running an
+    archive job after a crash does not write the flight twice.
+    """
+
+    def __init__(self, filepath=None):
+        self._filepath = filepath
+        self._records = []  # used when there is no file
+        self._keys = None   # (flight number, departure) already archived
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_record(flight, archived_at):
+        record = flight.to_dict()
+        record["archived_at"] = archived_at.strftime(DEPARTURE_FORMAT)
+        return record
+
+    @staticmethod
+    def _key(record):
+        return record["flight_number"], record["departure_time"]
+
+    def add(self, records):
+        """Append the records not archived yet; returns how many were new."""
+        with self._lock:
+            if self._keys is None:
+                self._keys = {self._key(r) for r in self.get_records()}
+            new = []
+            for record in records:
+                if self._key(record) not in self._keys:
+                    self._keys.add(self._key(record))
+                    new.append(record)
+            if not new:
+                return 0
+            if self._filepath is None:
+                self._records.extend(new)
+                return len(new)
+            with open(self._filepath, "a", encoding="utf-8") as f:
+                for record in new:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            return len(new)
+
+    def get_records(self):
+        if self._filepath is None:
+            return list(self._records)
+        if not os.path.exists(self._filepath):
+            return []
+        with open(self._filepath, "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
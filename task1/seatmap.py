@@ -0,0 +1,207 @@
+"""
+Seat-level inventory for a Flight.
+Each cabin (fare class) keeps one bit per seat in a bytearray, with every
+row padded to whole bytes so a row can be read as a single small integer.
+"""
+
+import base64
+
+
+def parse_seat(label):
+    """Split a seat label like "12A" into (12, "A")."""
+    label = label.strip().upper()
+    digits = label.rstrip("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+    letter = label[len(digits):]
+    if not digits.isdigit() or len(letter) != 1:
+        raise ValueError(f"Invalid seat label: {label}")
+    return int(digits), letter
+
+
+class Cabin:
+    """
+    One fare class, e.g. Cabin("J", 1, 5, "AC-DF").
+    `layout` lists the seat letters of a row, with "-" marking an aisle.
+    """
+
+    def __init__(self, fare_class, first_row, row_count, layout):
+        self._fare_class = fare_class
+        self._first_row = first_row
+        self._row_count = row_count
+        self._layout = layout
+        self._letters = layout.replace("-", "")
+        self._row_bytes = (len(self._letters) + 7) // 8
+        self._bits = bytearray(row_count * self._row_bytes)
+        self._free = row_count * len(self._letters)
+        self._window_cache = {}
+
+        # Seats are only "adjacent" inside one aisle-separated block
+        self._blocks = []
+        start = 0
+        for group in layout.split("-"):
+            self._blocks.append((start, len(group)))
+            start += len(group)
+
+    def get_fare_class(self):
+        return self._fare_class
+
+    def get_total_seats(self):
+        return self._row_count * len(self._letters)
+
+    def get_free_count(self):
+        return self._free
+
+    def has_row(self, row):
+        return self._first_row <= row < self._first_row + self._row_count
+
+    # -------------------------
+    # Bit helpers
+    # -------------------------
+    def _position(self, row, letter):
+        column = self._letters.find(letter)
+        if column < 0 or not self.has_row(row):
+            raise ValueError(f"Seat {row}{letter} is not in cabin {self._fare_class}")
+        offset = (row - self._first_row) * self._row_bytes + column // 8
+        return offset, 1 << (column % 8)
+
+    def _row_mask(self, index):
+        start = index * self._row_bytes
+        return int.from_bytes(self._bits[start:start + self._row_bytes], "little")
+
+    def _label(self, index, column):
+        return f"{self._first_row + index}{self._letters[column]}"
+
+    def _windows(self, count):
+        # Bit masks of every run of `count` seats that does not cross an aisle
+        if count not in self._window_cache:
+            windows = []
+            for start, size in self._blocks:
+                for column in range(start, start + size - count + 1):
+                    windows.append((column, ((1 << count) - 1) << column))
+            self._window_cache[count] = windows
+        return self._window_cache[count]
+
+    # -------------------------
+    # Seat operations
+    # -------------------------
+    def is_available(self, row, letter):
+        offset, bit = self._position(row, letter)
+        return not self._bits[offset] & bit
+
+    def take(self, row, letter):
+        offset, bit = self._position(row, letter)
+        if self._bits[offset] & bit:
+            return False
+        self._bits[offset] |= bit
+        self._free -= 1
+        return True
+
+    def release(self, row, letter):
+        offset, bit = self._position(row, letter)
+        if not self._bits[offset] & bit:
+            return False
+        self._bits[offset] &= ~bit
+        self._free += 1
+        return True
+
+    def find_adjacent(self, count):
+        """Labels of the first `count` side-by-side free seats, or None."""
+        if count < 1 or count > self._free:
+            return None
+        windows = self._windows(count)
+        if not windows:
+            return None
+        for index in range(self._row_count):
+            occupied = self._row_mask(index)
+            for column, mask in windows:
+                if not occupied & mask:
+                    return [self._label(index, column + i) for i in range(count)]
+        return None
+
+    # -------------------------
+    # Serialisation
+    # -------------------------
+    def layout_dict(self):
+        return {
+            "fare_class": self._fare_class,
+            "first_row": self._first_row,
+            "rows": self._row_count,
+            "layout": self._layout,
+        }
+
+    def get_bytes(self):
+        return bytes(self._bits)
+
+    def set_bytes(self, data):
+        self._bits = bytearray(data)
+        taken = sum(bin(b).count("1") for b in self._bits)
+        self._free = self.get_total_seats() - taken
+
+
+class SeatMap:
+    """All cabins of one flight, looked up by fare class or by seat row."""
+
+    def __init__(self, cabins):
+        self._cabins = list(cabins)
+
+    def get_cabins(self):
+        return self._cabins
+
+    def get_total_seats(self):
+        return sum(c.get_total_seats() for c in self._cabins)
+
+    def get_free_count(self, fare_class=None):
+        return sum(c.get_free_count() for c in self._select(fare_class))
+
+    def _select(self, fare_class):
+        if fare_class is None:
+            return self._cabins
+        return [c for c in self._cabins if c.get_fare_class() == fare_class]
+
+    def _cabin_for(self, row):
+        for cabin in self._cabins:
+            if cabin.has_row(row):
+                return cabin
+        raise ValueError(f"Row {row} does not exist on this aircraft")
+
+    def get_fare_class(self, label):
+        row, _ = parse_seat(label)
+        return self._cabin_for(row).get_fare_class()
+
+    def is_available(self, label):
+        row, letter = parse_seat(label)
+        return self._cabin_for(row).is_available(row, letter)
+
+    def take(self, label):
+        row, letter = parse_seat(label)
+        return self._cabin_for(row).take(row, letter)
+
+    def release(self, label):
+        row, letter = parse_seat(label)
+        return self._cabin_for(row).release(row, letter)
+
+    def find_adjacent(self, count, fare_class=None):
+        for cabin in self._select(fare_class):
+            seats = cabin.find_adjacent(count)
+            if seats:
+                return seats
+        return None
+
+    def to_dict(self):
+        # One base64 string of packed bits instead of a JSON entry per seat
+        packed = b"".join(c.get_bytes() for c in self._cabins)
+        return {
+            "cabins": [c.layout_dict() for c in self._cabins],
+            "bits": base64.b64encode(packed).decode("ascii"),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        cabins = [Cabin(c["fare_class"], c["first_row"], c["rows"], c["layout"])
+                  for c in data["cabins"]]
+        packed = base64.b64decode(data["bits"])
+        offset = 0
+        for cabin in cabins:
+            size = len(cabin.get_bytes())
+            cabin.set_bytes(packed[offset:offset + size])
+            offset += size
+        return cls(cabins)
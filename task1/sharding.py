@@ -0,0 +1,316 @@
+"""
+Sharded deployment of the Flight Booking System.
+Flights are hash-partitioned by flight number across worker processes,
+each owning its own System and persistence file, so bookings for
+different shards run on different cores.
+"""
+
+import os
+import threading
+import time
+import zlib
+from datetime import datetime
+from multiprocessing import Pipe, Process
+
+from flight_system import System
+from flights import Flight
+from passenger import Passenger
+from admin import Admin
+from changelog import flight_summary
+
+
+def shard_for(flight_number, shard_count):
+    # crc32 is stable across processes, unlike the built-in str hash
+    return zlib.crc32(flight_number.encode("utf-8")) % shard_count
+
+
+SAVE_INTERVAL = 1.0  # seconds a shard may hold unsaved writes
+MAX_IDLE_WAIT = 60   # seconds; keeps poll timeouts short for far-off departures
+
+
+# =========================================================
+# Worker side – runs inside each shard process
+# =========================================================
+class _ShardWorker:
+    """
+    Executes forwarded calls against one System shard.
+    Writes only mark the shard dirty; the main loop calls flush() once
+    SAVE_INTERVAL has passed since the first unsaved write, so a burst of
+    bookings costs one file rewrite instead of one each. Between requests
+    the main loop also runs the shard's due departure jobs.
+    """
+
+    WRITE_OPS = {"register_user", "add_flight", "remove_flight",
+                 "update_flight_time", "book_flight", "cancel_booking"}
+
+    def __init__(self, data_file, archive_file=None):
+        self._data_file = data_file  # None runs the shard in memory only
+        self._system = System(archive_file)
+        if data_file is not None:
+            self._system.load_from_json(data_file)
+        self._users = {u.get_username(): u for u in self._system.get_all_users()}
+        self._dirty_since = None  # time of the first unsaved write
+        self._save_count = 0
+        self._save_seconds = 0.0
+        # Close and archive anything that departed while the shard was down
+        self.run_due_jobs()
+
+    def register_user(self, user_data):
+        if user_data["username"] in self._users:
+            return "User registered successfully"
+        if user_data["type"] == "Admin":
+            user = Admin.from_dict(user_data)
+        else:
+            user = Passenger.from_dict(user_data)
+        self._users[user.get_username()] = user
+        return self._system.register_user(user)
+
+    def add_flight(self, flight_data):
+        return self._system.add_flight(Flight.from_dict(flight_data, self._users))
+
+    def remove_flight(self, flight_number):
+        return self._system.remove_flight(flight_number)
+
+    def update_flight_time(self, flight_number, new_time):
+        return self._system.update_flight_time(flight_number, new_time)
+
+    def book_flight(self, username, flight_number):
+        if username not in self._users:
+            return "User not found"
+        return self._system.book_flight(self._users[username], flight_number)
+
+    def cancel_booking(self, username, flight_number):
+        if username not in self._users:
+            return "User not found"
+        return self._system.cancel_booking(self._users[username], flight_number)
+
+    def get_all_flights(self):
+        return [flight_summary(f) for f in self._system.get_snapshot().get_all_flights()]
+
+    def search_flight(self, keyword):
+        return [flight_summary(f) for f in self._system.get_snapshot().search_flight(keyword)]
+
+    def get_bookings(self, username):
+        return [flight_summary(f) for f in self._system.get_snapshot().get_bookings(username)]
+
+    def get_save_stats(self):
+        return {"saves": self._save_count, "seconds": self._save_seconds}
+
+    def handle(self, op, args):
+        result = getattr(self, op)(*args)
+        if op in self.WRITE_OPS:
+            self._mark_dirty()
+        return result
+
+    # -------------------------
+    # Departure jobs
+    # -------------------------
+    def seconds_until_next_job(self):
+        """None when no job is queued, else how long until the next one is due."""
+        due = self._system.get_next_job_time()
+        if due is None:
+            return None
+        return max(0.0, (due - datetime.now()).total_seconds())
+
+    def run_due_jobs(self):
+        if self._system.run_due_jobs():
+            self._mark_dirty()
+
+    # -------------------------
+    # Persistence
+    # -------------------------
+    def _mark_dirty(self):
+        if self._data_file is not None and self._dirty_since is None:
+            self._dirty_since = time.monotonic()
+
+    def seconds_until_save(self, save_interval):
+        """None when there is nothing to save, else how long the save may wait."""
+        if self._dirty_since is None:
+            return None
+        return max(0.0, self._dirty_since + save_interval - time.monotonic())
+
+    def flush(self):
+        if self._dirty_since is None:
+            return
+        start = time.perf_counter()
+        self._system.save_to_json(self._data_file)
+        self._save_seconds += time.perf_counter() - start
+        self._save_count += 1
+        self._dirty_since = None
+
+
+def _shard_main(conn, data_file, archive_file, save_interval):
+    worker = _ShardWorker(data_file, archive_file)
+    while True:
+        # Wait for a request, but no longer than the next job or save deadline
+        wait = min(w for w in (MAX_IDLE_WAIT, worker.seconds_until_next_job(),
+                               worker.seconds_until_save(save_interval)) if w is not None)
+        # Deadlines win even if requests keep arriving
+        if wait == 0 or not conn.poll(wait):
+            worker.run_due_jobs()
+            if worker.seconds_until_save(save_interval) == 0:
+                worker.flush()
+            continue
+        op, args = conn.recv()
+        if op == "stop":
+            worker.flush()
+            conn.send((True, None))
+            break
+        try:
+            conn.send((True, worker.handle(op, args)))
+        except Exception as e:  # report back instead of killing the shard
+            conn.send((False, f"{type(e).__name__}: {e}"))
+    conn.close()
+
+
+# =========================================================
+# Router side – lives in the front-end process
+# =========================================================
+class ShardedSystem:
+    """
+    Routes System calls to N shard processes and merges fan-out results.
+    Shards save at most every `save_interval` seconds (and on stop), so a
+    crash can lose that much of the latest writes; `persist=False` keeps
+    every shard in memory only.
+    """
+
+    def __init__(self, shard_count, data_dir, persist=True, save_interval=SAVE_INTERVAL):
+        self._shard_count = shard_count
+        self._data_dir = data_dir
+        self._persist = persist
+        self._save_interval = save_interval
+        self._conns = []
+        self._locks = []
+        self._processes = []
+
+    def get_shard_count(self):
+        return self._shard_count
+
+    def get_data_file(self, index):
+        return os.path.join(self._data_dir, f"shard_{index}.json")
+
+    def get_archive_file(self, index):
+        return os.path.join(self._data_dir, f"shard_{index}.archive.jsonl")
+
+    def flush(self):
+        """Save every shard's pending writes now."""
+        for i in range(self._shard_count):
+            self._call(i, "flush")
+
+    def get_save_stats(self):
+        """Saves done and seconds spent saving, summed over all shards."""
+        totals = {"saves": 0, "seconds": 0.0}
+        for i in range(self._shard_count):
+            stats = self._call(i, "get_save_stats")
+            totals["saves"] += stats["saves"]
+            totals["seconds"] += stats["seconds"]
+        return totals
+
+    # -------------------------
+    # Lifecycle
+    # -------------------------
+    def start(self):
+        os.makedirs(self._data_dir, exist_ok=True)
+        for i in range(self._shard_count):
+            parent, child = Pipe()
+            data_file = self.get_data_file(i) if self._persist else None
+            # Each shard archives its own departed flights; in memory when not persisting
+            archive_file = self.get_archive_file(i) if self._persist else None
+            process = Process(target=_shard_main,
+                              args=(child, data_file, archive_file, self._save_interval),
+                              daemon=True)
+            process.start()
+            self._conns.append(parent)
+            self._locks.append(threading.Lock())
+            self._processes.append(process)
+
+    def stop(self):
+        for conn, lock in zip(self._conns, self._locks):
+            with lock:
+                conn.send(("stop", ()))
+                conn.recv()
+        for process in self._processes:
+            process.join()
+        self._conns, self._locks, self._processes = [], [], []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # -------------------------
+    # Transport
+    # -------------------------
+    def _call(self, index, op, *args):
+        # One request in flight per shard pipe; other shards stay usable
+        with self._locks[index]:
+            self._conns[index].send((op, args))
+            ok, result = self._conns[index].recv()
+        if not ok:
+            raise RuntimeError(f"Shard {index} failed on {op}: {result}")
+        return result
+
+    def _route(self, flight_number, op, *args):
+        return self._call(shard_for(flight_number, self._shard_count), op, flight_number, *args)
+
+    def _fan_out(self, op, *args):
+        # Send to every shard first so they all work in parallel, then collect
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            for conn in self._conns:
+                conn.send((op, args))
+            replies = [conn.recv() for conn in self._conns]
+        finally:
+            for lock in self._locks:
+                lock.release()
+        results = []
+        for index, (ok, result) in enumerate(replies):
+            if not ok:
+                raise RuntimeError(f"Shard {index} failed on {op}: {result}")
+            results.extend(result)
+        # Shards hold disjoint flights, so merging is just a global ordering
+        results.sort(key=lambda f: (f["departure"], f["number"]))
+        return results
+
+    # -------------------------
+    # Routed operations
+    # -------------------------
+    def register_user(self, user):
+        # Every shard needs the user to attach bookings to it
+        user_data = user.to_dict()
+        for i in range(self._shard_count):
+            self._call(i, "register_user", user_data)
+        return "User registered successfully"
+
+    def add_flight(self, flight):
+        index = shard_for(flight.get_flight_number(), self._shard_count)
+        return self._call(index, "add_flight", flight.to_dict())
+
+    def remove_flight(self, flight_number):
+        return self._route(flight_number, "remove_flight")
+
+    def update_flight_time(self, flight_number, new_time):
+        return self._route(flight_number, "update_flight_time", new_time)
+
+    def book_flight(self, username, flight_number):
+        return self._call(shard_for(flight_number, self._shard_count),
+                          "book_flight", username, flight_number)
+
+    def cancel_booking(self, username, flight_number):
+        return self._call(shard_for(flight_number, self._shard_count),
+                          "cancel_booking", username, flight_number)
+
+    # -------------------------
+    # Fan-out queries
+    # -------------------------
+    def get_all_flights(self):
+        return self._fan_out("get_all_flights")
+
+    def search_flight(self, keyword):
+        return self._fan_out("search_flight", keyword)
+
+    def get_my_bookings(self, username):
+        return self._fan_out("get_bookings", username)
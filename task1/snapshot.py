@@ -0,0 +1,162 @@
+"""
+Immutable read snapshots of the Flight Booking System.
+Writers publish a new SystemSnapshot after each write batch; readers
+grab the current one and never see a half-applied change.
+"""
+
+
+BUCKET_COUNT = 64
+
+
+class FlightView:
+    """Read-only copy of one Flight, with passengers stored as usernames."""
+
+    __slots__ = ("_flight_number", "_origin", "_destination", "_departure_time",
+                 "_capacity", "_aircraft", "_passengers", "_seat_data", "_booking_open")
+
+    def __init__(self, flight):
+        self._flight_number = flight.get_flight_number()
+        self._origin = flight.get_origin()
+        self._destination = flight.get_destination()
+        self._departure_time = flight.get_departure_time()
+        self._capacity = flight.get_capacity()
+        self._aircraft = flight.get_aircraft()
+        self._passengers = tuple(flight.get_passenger_usernames())
+        self._booking_open = flight.is_booking_open()
+        seat_map = flight.get_seat_map()
+        self._seat_data = None
+        if seat_map is not None:
+            self._seat_data = (seat_map.to_dict(), dict(flight.get_seat_assignments()))
+
+    def get_flight_number(self):
+        return self._flight_number
+
+    def get_origin(self):
+        return self._origin
+
+    def get_destination(self):
+        return self._destination
+
+    def get_departure_time(self):
+        return self._departure_time
+
+    def get_capacity(self):
+        return self._capacity
+
+    def get_aircraft(self):
+        return self._aircraft
+
+    def is_booking_open(self):
+        return self._booking_open
+
+    def get_booked_count(self):
+        return len(self._passengers)
+
+    def get_available_seats(self):
+        return self._capacity - len(self._passengers)
+
+    def get_passenger_usernames(self):
+        return self._passengers
+
+    def to_dict(self):
+        data = {
+            "flight_number": self._flight_number,
+            "origin": self._origin,
+            "destination": self._destination,
+            "departure_time": self._departure_time,
+            "capacity": self._capacity,
+            "aircraft": self._aircraft,
+            "booked_passengers": list(self._passengers),
+        }
+        if self._seat_data is not None:
+            data["seat_map"] = self._seat_data[0]
+            data["seat_assignments"] = dict(self._seat_data[1])
+        return data
+
+
+class SystemSnapshot:
+    """
+    One published version of the System state.
+    Flights are spread over BUCKET_COUNT dicts; a new version copies only the
+    buckets it touches and shares every other bucket with the previous one.
+    """
+
+    def __init__(self, version=0, order=(), buckets=None, users=None):
+        self._version = version
+        self._order = order  # flight keys in schedule order
+        self._buckets = buckets if buckets is not None else tuple({} for _ in range(BUCKET_COUNT))
+        self._users = users if users is not None else {}  # username -> user dict
+
+    @staticmethod
+    def _bucket_of(key):
+        # Keys are object ids, which are 16-byte aligned, so drop the low bits
+        return (key >> 4) % BUCKET_COUNT
+
+    # -------------------------
+    # Building new versions
+    # -------------------------
+    def evolve(self, changed_flights=None, removed_keys=(), order=None, changed_users=()):
+        """
+        Return the next version. `changed_flights` maps flight key -> Flight,
+        `order` is the new key tuple (only when flights were added/removed).
+        """
+        changed_flights = changed_flights or {}
+        buckets = list(self._buckets)
+        copied = set()
+        for key in list(removed_keys) + list(changed_flights):
+            index = self._bucket_of(key)
+            if index not in copied:
+                buckets[index] = dict(buckets[index])
+                copied.add(index)
+        for key in removed_keys:
+            buckets[self._bucket_of(key)].pop(key, None)
+        for key, flight in changed_flights.items():
+            buckets[self._bucket_of(key)][key] = FlightView(flight)
+
+        users = self._users
+        if changed_users:
+            users = dict(users)
+            for user in changed_users:
+                users[user.get_username()] = user.to_dict()
+
+        return SystemSnapshot(self._version + 1,
+                              self._order if order is None else order,
+                              tuple(buckets), users)
+
+    # -------------------------
+    # Queries
+    # -------------------------
+    def get_version(self):
+        return self._version
+
+    def get_all_flights(self):
+        for key in self._order:
+            yield self._buckets[self._bucket_of(key)][key]
+
+    def get_flight(self, flight_number):
+        for flight in self.get_all_flights():
+            if flight.get_flight_number() == flight_number:
+                return flight
+        return None
+
+    def search_flight(self, keyword):
+        keyword = keyword.lower()
+        return [f for f in self.get_all_flights()
+                if keyword in f.get_flight_number().lower()
+                or keyword in f.get_origin().lower()
+                or keyword in f.get_destination().lower()]
+
+    def get_bookings(self, username):
+        return [f for f in self.get_all_flights() if username in f.get_passenger_usernames()]
+
+    def get_user(self, username):
+        return self._users.get(username)
+
+    # -------------------------
+    # Persistence
+    # -------------------------
+    def to_dict(self):
+        return {
+            "users": list(self._users.values()),
+            "flights": [f.to_dict() for f in self.get_all_flights()],
+        }